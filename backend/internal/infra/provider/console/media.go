@@ -603,6 +603,12 @@ func normalizeConsoleImageResolution(value string) (string, error) {
 	return value, nil
 }
 
+// consoleImageAspectRatios 在包级构建一次，避免每次生图请求重建映射表。
+var consoleImageAspectRatios = map[string]string{
+	"1:1": "1:1", "16:9": "16:9", "9:16": "9:16", "4:3": "4:3", "3:4": "3:4", "3:2": "3:2", "2:3": "2:3", "2:1": "2:1", "1:2": "1:2",
+	"1024x1024": "1:1", "1280x720": "16:9", "720x1280": "9:16", "1792x1024": "3:2", "1536x1024": "3:2", "1024x1792": "2:3", "1024x1536": "2:3",
+}
+
 func resolveConsoleImageAspectRatio(aspectRatio, size string) (string, error) {
 	value := strings.ToLower(strings.TrimSpace(aspectRatio))
 	if value == "" {
@@ -611,11 +617,7 @@ func resolveConsoleImageAspectRatio(aspectRatio, size string) (string, error) {
 	if value == "" || value == "auto" {
 		return "", nil
 	}
-	values := map[string]string{
-		"1:1": "1:1", "16:9": "16:9", "9:16": "9:16", "4:3": "4:3", "3:4": "3:4", "3:2": "3:2", "2:3": "2:3", "2:1": "2:1", "1:2": "1:2",
-		"1024x1024": "1:1", "1280x720": "16:9", "720x1280": "9:16", "1792x1024": "3:2", "1536x1024": "3:2", "1024x1792": "2:3", "1024x1536": "2:3",
-	}
-	if resolved := values[value]; resolved != "" {
+	if resolved := consoleImageAspectRatios[value]; resolved != "" {
 		return resolved, nil
 	}
 	return "", errors.New("aspect_ratio 或 size 不受支持")
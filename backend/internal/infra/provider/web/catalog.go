@@ -45,7 +45,9 @@ func Resolve(upstreamModel string) (ModelSpec, bool) {
 	return ModelSpec{}, false
 }
 
+// webTierRank 在包级构建一次；ListModels 会对目录中每个模型调用 TierSupports。
+var webTierRank = map[account.WebTier]int{account.WebTierBasic: 1, account.WebTierSuper: 2, account.WebTierHeavy: 3}
+
 func TierSupports(actual, minimum account.WebTier) bool {
-	rank := map[account.WebTier]int{account.WebTierBasic: 1, account.WebTierSuper: 2, account.WebTierHeavy: 3}
-	return rank[actual] >= rank[minimum]
+	return webTierRank[actual] >= webTierRank[minimum]
 }
@@ -15,6 +15,7 @@ import (
 	"net/url"
 	"regexp"
 	"strings"
+	"sync"
 	"time"
 	"unicode/utf8"
 
@@ -1146,7 +1147,7 @@ func (a *Adapter) archiveChatImages(ctx context.Context, credential account.Cred
 		if parsed.Text.Len() > 0 {
 			parsed.Text.WriteString("\n\n")
 		}
-		parsed.Text.WriteString(liteImageMarkdown(item))
+		writeLiteImageMarkdown(&parsed.Text, item)
 	}
 	return nil
 }
@@ -2060,7 +2061,7 @@ func writeStreamDone(writer io.Writer, operation, responseID, model string, pars
 			chunk["search_sources"] = sources
 		}
 		writeSSE(writer, "", chunk)
-		_, _ = io.WriteString(writer, "data: [DONE]\n\n")
+		_, _ = writer.Write(sseDoneFrame)
 		return
 	}
 	if operation == conversation.OperationMessages {
@@ -2083,17 +2084,37 @@ func writeStreamDone(writer io.Writer, operation, responseID, model string, pars
 	writeSSE(writer, "response.completed", map[string]any{"type": "response.completed", "response": payload})
 }
 
+var sseDoneFrame = []byte("data: [DONE]\n\n")
+
+// sseFramePool 复用 SSE 帧缓冲；超过 maxPooledSSEFrame 的大帧（如图片分片）用完即弃，
+// 避免池中长期持有 MiB 级缓冲。
+var sseFramePool = sync.Pool{New: func() any { return new(bytes.Buffer) }}
+
+const maxPooledSSEFrame = 64 << 10
+
+// writeSSE 把事件行和数据行直接编码进同一个帧缓冲后单次写出；下游通常是 io.Pipe，
+// 每次 Write 都是一次同步交接，逐行写出会让每个事件多付一次交接成本。
+// io.Writer 约定不得保留 p，因此 Write 返回后缓冲即可归还。
 func writeSSE(writer io.Writer, event string, value any) error {
-	data, err := json.Marshal(value)
-	if err != nil {
-		return err
-	}
-	if event != "" {
-		if _, err := fmt.Fprintf(writer, "event: %s\n", event); err != nil {
-			return err
+	frame := sseFramePool.Get().(*bytes.Buffer)
+	frame.Reset()
+	defer func() {
+		if frame.Cap() <= maxPooledSSEFrame {
+			sseFramePool.Put(frame)
 		}
+	}()
+	if event != "" {
+		frame.WriteString("event: ")
+		frame.WriteString(event)
+		frame.WriteByte('\n')
+	}
+	frame.WriteString("data: ")
+	// Encode 的输出与 json.Marshal 相同，只是末尾多一个换行，正好作为数据行结束符。
+	if err := json.NewEncoder(frame).Encode(value); err != nil {
+		return err
 	}
-	_, err = fmt.Fprintf(writer, "data: %s\n\n", data)
+	frame.WriteByte('\n')
+	_, err := writer.Write(frame.Bytes())
 	return err
 }
 
@@ -2111,18 +2132,18 @@ func newWebID(prefix string) string {
 	return prefix + "_" + hex.EncodeToString(value)
 }
 
+// streamHeaders/jsonHeaders 每次返回新 map：下游转发时可能追加头部，不能共享；
+// 键已是规范形式，用字面量一次建好，省掉逐个 Set 的规范化与扩容。
 func streamHeaders() http.Header {
-	value := http.Header{}
-	value.Set("Content-Type", "text/event-stream; charset=utf-8")
-	value.Set("Cache-Control", "no-cache")
-	value.Set("X-Accel-Buffering", "no")
-	return value
+	return http.Header{
+		"Content-Type":      {"text/event-stream; charset=utf-8"},
+		"Cache-Control":     {"no-cache"},
+		"X-Accel-Buffering": {"no"},
+	}
 }
 
 func jsonHeaders() http.Header {
-	value := http.Header{}
-	value.Set("Content-Type", "application/json; charset=utf-8")
-	return value
+	return http.Header{"Content-Type": {"application/json; charset=utf-8"}}
 }
 
 func jsonProviderResponse(status int, value any) *provider.Response {
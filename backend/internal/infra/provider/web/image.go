@@ -14,6 +14,7 @@ import (
 	"net/url"
 	"sort"
 	"strings"
+	"sync"
 	"time"
 
 	fhttp "github.com/bogdanfinn/fhttp"
@@ -30,6 +31,7 @@ const (
 	maxGeneratedImages            = 10
 	mediaOutputAttempts           = 3
 	imageDownloadTimeout          = 60 * time.Second
+	imageDownloadConcurrency      = 1
 	imagineSelfUploadSource       = "IMAGINE_SELF_UPLOAD_FILE_SOURCE"
 	directFileUploadResponseLimit = 2 << 20
 )
@@ -512,7 +514,7 @@ func (a *Adapter) forwardLiteChatCompletion(ctx context.Context, request provide
 		if parsed.Text.Len() > 0 {
 			parsed.Text.WriteString("\n\n")
 		}
-		parsed.Text.WriteString(liteImageMarkdown(item))
+		writeLiteImageMarkdown(&parsed.Text, item)
 	}
 	payload := buildOpenAIResult("chat", responseID, input.Model, parsed, false)
 	data, err := json.Marshal(payload)
@@ -552,17 +554,32 @@ func (a *Adapter) streamLiteChatImages(ctx context.Context, writer *io.PipeWrite
 }
 
 func liteImageMarkdown(item map[string]any) string {
+	var builder strings.Builder
+	writeLiteImageMarkdown(&builder, item)
+	return builder.String()
+}
+
+// writeLiteImageMarkdown 直接写入累积文本，避免 b64_json 结果先拼成多 MiB 临时字符串再复制一次。
+func writeLiteImageMarkdown(builder *strings.Builder, item map[string]any) {
 	if value, _ := item["url"].(string); value != "" {
-		return "![image](" + value + ")"
+		builder.Grow(len("![image]()") + len(value))
+		builder.WriteString("![image](")
+		builder.WriteString(value)
+		builder.WriteByte(')')
+		return
 	}
 	if value, _ := item["b64_json"].(string); value != "" {
 		mimeType, _ := item["mime_type"].(string)
 		if mimeType == "" {
 			mimeType = "image/jpeg"
 		}
-		return "![image](data:" + mimeType + ";base64," + value + ")"
+		builder.Grow(len("![image](data:;base64,)") + len(mimeType) + len(value))
+		builder.WriteString("![image](data:")
+		builder.WriteString(mimeType)
+		builder.WriteString(";base64,")
+		builder.WriteString(value)
+		builder.WriteByte(')')
 	}
-	return ""
 }
 
 func (a *Adapter) generateWSImage(ctx context.Context, request provider.ImageGenerationRequest, count int, format, ratio, resolution string, modelConfig imagineModelConfig) (*provider.Response, error) {
@@ -1375,27 +1392,67 @@ func (a *Adapter) postJSONWithReferer(ctx context.Context, cfg Config, lease *eg
 	return nil, fmt.Errorf("Grok Web Statsig 刷新失败")
 }
 
+// imageResponse 并发解码并落盘各张图片，结果按原顺序输出。需要走网络的 URL 下载
+// 共用 imageDownloadConcurrency 个令牌：同一账号的上游下载仍逐张进行，不改变上游
+// 看到的请求节奏。首个失败会取消其余任务，并返回该首个错误而非随之产生的取消错误。
 func (a *Adapter) imageResponse(ctx context.Context, credential account.Credential, urls, blobs []string, count int, format string) (*provider.Response, error) {
-	data := make([]any, 0, min(count, len(urls)))
-	for index := 0; index < count && index < len(urls); index++ {
+	total := max(0, min(count, len(urls)))
+	data := make([]any, total)
+	if total == 1 {
+		image := imagineImageValue{URL: urls[0]}
+		if len(blobs) > 0 {
+			image.Blob = blobs[0]
+		}
+		item, err := a.imageDataItem(ctx, credential, image, format)
+		if err != nil {
+			return nil, err
+		}
+		data[0] = item
+		return jsonProviderResponse(http.StatusOK, map[string]any{"created": time.Now().Unix(), "data": data}), nil
+	}
+	itemCtx, cancel := context.WithCancel(ctx)
+	defer cancel()
+	downloads := make(chan struct{}, imageDownloadConcurrency)
+	var (
+		group    sync.WaitGroup
+		failOnce sync.Once
+		firstErr error
+	)
+	for index := range total {
 		blob := ""
 		if index < len(blobs) {
 			blob = blobs[index]
 		}
-		item, err := a.imageDataItem(ctx, credential, imagineImageValue{URL: urls[index], Blob: blob}, format)
-		if err != nil {
-			return nil, err
-		}
-		data = append(data, item)
+		group.Add(1)
+		go func(index int, image imagineImageValue) {
+			defer group.Done()
+			item, err := a.limitedImageDataItem(itemCtx, credential, image, format, downloads)
+			if err != nil {
+				failOnce.Do(func() {
+					firstErr = err
+					cancel()
+				})
+				return
+			}
+			data[index] = item
+		}(index, imagineImageValue{URL: urls[index], Blob: blob})
+	}
+	group.Wait()
+	if firstErr != nil {
+		return nil, firstErr
 	}
 	return jsonProviderResponse(http.StatusOK, map[string]any{"created": time.Now().Unix(), "data": data}), nil
 }
 
 func (a *Adapter) imageDataItem(ctx context.Context, credential account.Credential, image imagineImageValue, format string) (map[string]any, error) {
+	return a.limitedImageDataItem(ctx, credential, image, format, nil)
+}
+
+func (a *Adapter) limitedImageDataItem(ctx context.Context, credential account.Credential, image imagineImageValue, format string, downloads chan struct{}) (map[string]any, error) {
 	if a.assets == nil {
 		return nil, provider.NewMediaPostProcessingError(provider.MediaPostProcessingStorage, fmt.Errorf("图片媒体存储未配置"))
 	}
-	raw, err := a.imageBytes(ctx, credential, image)
+	raw, err := a.limitedImageBytes(ctx, credential, image, downloads)
 	if err != nil {
 		return nil, provider.NewMediaPostProcessingError(provider.MediaPostProcessingDownload, err)
 	}
@@ -1429,6 +1486,12 @@ func (a *Adapter) saveImageWithRetry(ctx context.Context, raw []byte) (mediadoma
 }
 
 func (a *Adapter) imageBytes(ctx context.Context, credential account.Credential, image imagineImageValue) ([]byte, error) {
+	return a.limitedImageBytes(ctx, credential, image, nil)
+}
+
+// limitedImageBytes 在 downloads 非 nil 时，只有真正需要网络下载才占用其中一个令牌；
+// 内联 Blob 的解码不受限制。
+func (a *Adapter) limitedImageBytes(ctx context.Context, credential account.Credential, image imagineImageValue, downloads chan struct{}) ([]byte, error) {
 	if strings.TrimSpace(image.Blob) != "" {
 		raw, err := decodeImageBlob(image.Blob)
 		if err == nil {
@@ -1438,6 +1501,14 @@ func (a *Adapter) imageBytes(ctx context.Context, credential account.Credential,
 			return nil, err
 		}
 	}
+	if downloads != nil {
+		select {
+		case downloads <- struct{}{}:
+			defer func() { <-downloads }()
+		case <-ctx.Done():
+			return nil, ctx.Err()
+		}
+	}
 	return a.downloadImage(ctx, credential, image.URL)
 }
 
@@ -1547,12 +1618,15 @@ func openAIImageStreamEvent(eventType string, image imagineImageValue, raw []byt
 	return value
 }
 
+var pngSignature = []byte("\x89PNG\r\n\x1a\n")
+
+// imageOutputFormat 只需区分 png/webp/jpeg，直接比对文件头魔数，
+// 不必让 http.DetectContentType 逐条遍历全部 MIME 签名表。
 func imageOutputFormat(raw []byte) string {
-	mimeType := http.DetectContentType(raw)
-	switch mimeType {
-	case "image/png":
+	switch {
+	case bytes.HasPrefix(raw, pngSignature):
 		return "png"
-	case "image/webp":
+	case len(raw) >= 14 && string(raw[:4]) == "RIFF" && string(raw[8:14]) == "WEBPVP":
 		return "webp"
 	default:
 		return "jpeg"
@@ -1652,7 +1726,8 @@ func waitMediaOutputRetry(ctx context.Context, attempt int) error {
 
 func decodeImageBlob(value string) ([]byte, error) {
 	value = strings.TrimSpace(value)
-	if strings.HasPrefix(strings.ToLower(value), "data:") {
+	// 只比较前缀，不对整段多 MiB 的 Base64 做 ToLower 拷贝。
+	if len(value) >= 5 && strings.EqualFold(value[:5], "data:") {
 		comma := strings.IndexByte(value, ',')
 		if comma < 0 || !strings.Contains(strings.ToLower(value[:comma]), ";base64") {
 			return nil, fmt.Errorf("图片 blob data URI 无效")
@@ -1662,9 +1737,16 @@ func decodeImageBlob(value string) ([]byte, error) {
 	if value == "" || base64.StdEncoding.DecodedLen(len(value)) > 32<<20 {
 		return nil, fmt.Errorf("图片 blob 为空或超过 32 MiB")
 	}
-	raw, err := base64.StdEncoding.DecodeString(value)
+	// 按长度决定先试哪种编码：不含换行时带填充的 Base64 长度必为 4 的倍数，
+	// 干净输入一次即可解码成功。解码器会忽略 \r/\n，长度不能作为最终判断，
+	// 失败时仍用另一种编码重试，接受范围与标准、无填充两种形式的并集一致。
+	first, second := base64.StdEncoding, base64.RawStdEncoding
+	if len(value)%4 != 0 {
+		first, second = second, first
+	}
+	raw, err := first.DecodeString(value)
 	if err != nil {
-		raw, err = base64.RawStdEncoding.DecodeString(value)
+		raw, err = second.DecodeString(value)
 	}
 	if err != nil || len(raw) == 0 || len(raw) > 32<<20 {
 		return nil, fmt.Errorf("图片 blob Base64 无效")
@@ -1695,12 +1777,14 @@ func imagineRequestMessage(id, prompt, ratio string, nsfw, pro bool, generations
 	return map[string]any{"type": "conversation.item.create", "timestamp": time.Now().UnixMilli(), "item": map[string]any{"type": "message", "content": []any{map[string]any{"requestId": id, "text": prompt, "type": "input_text", "properties": map[string]any{"section_count": 0, "is_kids_mode": false, "enable_nsfw": nsfw, "skip_upsampler": false, "enable_side_by_side": true, "is_initial": false, "aspect_ratio": ratio, "enable_pro": pro, "num_generations": generations}}}}}
 }
 
+// imageAspectRatios 在包级构建一次，避免每次生图请求重建映射表。
+var imageAspectRatios = map[string]string{
+	"auto": "auto", "1:1": "1:1", "16:9": "16:9", "9:16": "9:16", "4:3": "4:3", "3:4": "3:4",
+	"3:2": "3:2", "2:3": "2:3", "2:1": "2:1", "1:2": "1:2", "19.5:9": "19.5:9", "9:19.5": "9:19.5", "20:9": "20:9", "9:20": "9:20",
+	"1280x720": "16:9", "720x1280": "9:16", "1792x1024": "3:2", "1536x1024": "3:2", "1024x1792": "2:3", "1024x1536": "2:3", "1024x1024": "1:1",
+}
+
 func resolveImageAspectRatio(aspectRatio, size string) (string, error) {
-	values := map[string]string{
-		"auto": "auto", "1:1": "1:1", "16:9": "16:9", "9:16": "9:16", "4:3": "4:3", "3:4": "3:4",
-		"3:2": "3:2", "2:3": "2:3", "2:1": "2:1", "1:2": "1:2", "19.5:9": "19.5:9", "9:19.5": "9:19.5", "20:9": "20:9", "9:20": "9:20",
-		"1280x720": "16:9", "720x1280": "9:16", "1792x1024": "3:2", "1536x1024": "3:2", "1024x1792": "2:3", "1024x1536": "2:3", "1024x1024": "1:1",
-	}
 	value := strings.ToLower(strings.TrimSpace(aspectRatio))
 	if value == "" {
 		value = strings.ToLower(strings.TrimSpace(size))
@@ -1708,7 +1792,7 @@ func resolveImageAspectRatio(aspectRatio, size string) (string, error) {
 	if value == "" {
 		return "auto", nil
 	}
-	if resolved := values[value]; resolved != "" {
+	if resolved := imageAspectRatios[value]; resolved != "" {
 		return resolved, nil
 	}
 	return "", fmt.Errorf("aspect_ratio 不受支持")
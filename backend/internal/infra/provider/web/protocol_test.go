@@ -16,6 +16,7 @@ import (
 	"path/filepath"
 	"slices"
 	"strings"
+	"sync/atomic"
 	"testing"
 
 	fhttp "github.com/bogdanfinn/fhttp"
@@ -193,6 +194,21 @@ func TestParseChatImageDataURIValidatesContent(t *testing.T) {
 	}
 }
 
+func TestLiteImageMarkdownAppendsToExistingText(t *testing.T) {
+	if got := liteImageMarkdown(map[string]any{"url": "https://example.com/a.png"}); got != "![image](https://example.com/a.png)" {
+		t.Fatalf("url markdown = %q", got)
+	}
+	var builder strings.Builder
+	builder.WriteString("prefix\n\n")
+	writeLiteImageMarkdown(&builder, map[string]any{"b64_json": "aGVsbG8="})
+	if got := builder.String(); got != "prefix\n\n![image](data:image/jpeg;base64,aGVsbG8=)" {
+		t.Fatalf("base64 markdown = %q", got)
+	}
+	if got := liteImageMarkdown(map[string]any{}); got != "" {
+		t.Fatalf("empty item markdown = %q", got)
+	}
+}
+
 func TestParseChatFileDataURIValidatesAndSanitizesFile(t *testing.T) {
 	pdf := "data:application/pdf;base64,JVBERi0xLjQKJSVFT0Y="
 	file, err := parseChatFileDataURI(pdf, "../report.pdf", 1<<20)
@@ -1014,6 +1030,125 @@ func TestWebMediaUpstreamDiagnosticLogsStageHeadersWithoutBodyPreview(t *testing
 	}
 }
 
+func TestStreamHeadersAreIndependentPerResponse(t *testing.T) {
+	first := streamHeaders()
+	if first.Get("Content-Type") != "text/event-stream; charset=utf-8" || first.Get("Cache-Control") != "no-cache" || first.Get("X-Accel-Buffering") != "no" {
+		t.Fatalf("stream headers = %#v", first)
+	}
+	first.Set("Cache-Control", "private")
+	if streamHeaders().Get("Cache-Control") != "no-cache" {
+		t.Fatal("stream headers must not be shared between responses")
+	}
+	if jsonHeaders().Get("Content-Type") != "application/json; charset=utf-8" {
+		t.Fatalf("json headers = %#v", jsonHeaders())
+	}
+}
+
+type sseWriteRecorder struct {
+	writes []string
+}
+
+func (r *sseWriteRecorder) Write(p []byte) (int, error) {
+	r.writes = append(r.writes, string(p))
+	return len(p), nil
+}
+
+func TestWriteSSEWritesOneMarshalledFramePerEvent(t *testing.T) {
+	values := []struct {
+		event string
+		value any
+	}{
+		{value: map[string]any{"content": "<b>你好</b> & \u2028"}},
+		{event: "response.output_text.delta", value: map[string]any{"delta": "ok"}},
+		{value: []int{1, 2, 3}},
+	}
+	recorder := &sseWriteRecorder{}
+	for _, item := range values {
+		if err := writeSSE(recorder, item.event, item.value); err != nil {
+			t.Fatal(err)
+		}
+	}
+	if err := writeSSE(recorder, "", make(chan int)); err == nil {
+		t.Fatal("unsupported values must fail to encode")
+	}
+	if len(recorder.writes) != len(values) {
+		t.Fatalf("writes = %q", recorder.writes)
+	}
+	for index, item := range values {
+		data, err := json.Marshal(item.value)
+		if err != nil {
+			t.Fatal(err)
+		}
+		want := "data: " + string(data) + "\n\n"
+		if item.event != "" {
+			want = "event: " + item.event + "\n" + want
+		}
+		if recorder.writes[index] != want {
+			t.Fatalf("frame %d = %q, want %q", index, recorder.writes[index], want)
+		}
+	}
+}
+
+func TestDecodeImageBlobAcceptsPaddedAndUnpaddedBase64(t *testing.T) {
+	for _, payload := range [][]byte{[]byte("png"), []byte("webp"), []byte("jpeg!")} {
+		for _, value := range []string{
+			base64.StdEncoding.EncodeToString(payload),
+			base64.RawStdEncoding.EncodeToString(payload),
+			"data:image/png;base64," + base64.StdEncoding.EncodeToString(payload),
+			"DATA:image/png;BASE64," + base64.StdEncoding.EncodeToString(payload),
+		} {
+			raw, err := decodeImageBlob(value)
+			if err != nil || !bytes.Equal(raw, payload) {
+				t.Fatalf("decodeImageBlob(%q) = %q, %v", value, raw, err)
+			}
+		}
+	}
+	// 解码器忽略换行，长度取模不能区分填充与否，两种形式都必须继续可解。
+	for _, test := range []struct {
+		value   string
+		payload string
+	}{
+		{value: "aGVs\nbG8=", payload: "hello"},
+		{value: "aGVs\r\nbG8=", payload: "hello"},
+		{value: "aGVs\nbG8", payload: "hello"},
+		{value: "aGVsbG8h\ncG5n\nd2Vi", payload: "hello!pngweb"},
+		{value: "aGVsbG8h\nd2VicA", payload: "hello!webp"},
+		{value: "data:image/png;base64,aGVs\nbG8", payload: "hello"},
+	} {
+		raw, err := decodeImageBlob(test.value)
+		if err != nil || string(raw) != test.payload {
+			t.Fatalf("decodeImageBlob(%q) = %q, %v", test.value, raw, err)
+		}
+	}
+	for _, value := range []string{"", "data:image/png,abcd", "cG5n=", "@@@@"} {
+		if _, err := decodeImageBlob(value); err == nil {
+			t.Fatalf("decodeImageBlob(%q) should fail", value)
+		}
+	}
+}
+
+func TestImageOutputFormatMatchesContentSniffing(t *testing.T) {
+	for _, raw := range [][]byte{
+		[]byte("\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"),
+		[]byte("RIFF\x10\x00\x00\x00WEBPVP8 "),
+		[]byte("RIFF\x10\x00\x00\x00WAVEfmt "),
+		[]byte("\xff\xd8\xff\xe0\x00\x10JFIF"),
+		[]byte("GIF89a"),
+		nil,
+	} {
+		want := "jpeg"
+		switch http.DetectContentType(raw) {
+		case "image/png":
+			want = "png"
+		case "image/webp":
+			want = "webp"
+		}
+		if got := imageOutputFormat(raw); got != want {
+			t.Fatalf("imageOutputFormat(%q) = %q, want %q", raw, got, want)
+		}
+	}
+}
+
 func TestChatModelsUseLowestSufficientTierFirst(t *testing.T) {
 	adapter := &Adapter{}
 	tests := []struct {
@@ -1355,6 +1490,69 @@ func TestImageDataItemClassifiesExhaustedStorageFailure(t *testing.T) {
 	}
 }
 
+func TestImageResponseKeepsOrderAcrossConcurrentItems(t *testing.T) {
+	adapter := &Adapter{assets: imageAssetStoreEchoStub{}}
+	blobs := []string{
+		base64.StdEncoding.EncodeToString([]byte("first")),
+		base64.StdEncoding.EncodeToString([]byte("second")),
+		base64.StdEncoding.EncodeToString([]byte("third")),
+	}
+	urls := []string{"https://imgen.x.ai/1.jpg", "https://imgen.x.ai/2.jpg", "https://imgen.x.ai/3.jpg"}
+	response, err := adapter.imageResponse(context.Background(), account.Credential{}, urls, blobs, 3, "url")
+	if err != nil {
+		t.Fatal(err)
+	}
+	var body struct {
+		Data []struct {
+			URL string `json:"url"`
+		} `json:"data"`
+	}
+	if err := json.NewDecoder(response.Body).Decode(&body); err != nil {
+		t.Fatal(err)
+	}
+	if len(body.Data) != 3 || body.Data[0].URL != "https://api.example/first" || body.Data[1].URL != "https://api.example/second" || body.Data[2].URL != "https://api.example/third" {
+		t.Fatalf("image response data = %#v", body.Data)
+	}
+	single, err := adapter.imageResponse(context.Background(), account.Credential{}, urls[:1], blobs[:1], 1, "url")
+	if err != nil {
+		t.Fatal(err)
+	}
+	if err := json.NewDecoder(single.Body).Decode(&body); err != nil || len(body.Data) != 1 || body.Data[0].URL != "https://api.example/first" {
+		t.Fatalf("single image response data = %#v, err = %v", body.Data, err)
+	}
+}
+
+func TestImageResponseReturnsFirstFailureNotSiblingCancellation(t *testing.T) {
+	store := &imageAssetStoreBlockingStub{}
+	adapter := &Adapter{assets: store}
+	blobs := []string{base64.StdEncoding.EncodeToString([]byte("first")), "@@@@", base64.StdEncoding.EncodeToString([]byte("third"))}
+	_, err := adapter.imageResponse(context.Background(), account.Credential{}, []string{"", "", ""}, blobs, 3, "url")
+	var processingErr *provider.MediaPostProcessingError
+	if !errors.As(err, &processingErr) || processingErr.Stage != provider.MediaPostProcessingDownload || errors.Is(err, context.Canceled) {
+		t.Fatalf("first failure err = %v", err)
+	}
+	if canceled := store.canceled.Load(); canceled != 2 {
+		t.Fatalf("canceled sibling saves = %d, want 2", canceled)
+	}
+}
+
+func TestLimitedImageBytesWaitsForDownloadSlotOnlyForURLs(t *testing.T) {
+	adapter := &Adapter{}
+	downloads := make(chan struct{}, imageDownloadConcurrency)
+	for range imageDownloadConcurrency {
+		downloads <- struct{}{}
+	}
+	raw, err := adapter.limitedImageBytes(context.Background(), account.Credential{}, imagineImageValue{URL: "https://imgen.x.ai/1.jpg", Blob: base64.StdEncoding.EncodeToString([]byte("inline"))}, downloads)
+	if err != nil || string(raw) != "inline" {
+		t.Fatalf("inline blob = %q, %v", raw, err)
+	}
+	ctx, cancel := context.WithCancel(context.Background())
+	cancel()
+	if _, err := adapter.limitedImageBytes(ctx, account.Credential{}, imagineImageValue{URL: "https://imgen.x.ai/1.jpg"}, downloads); !errors.Is(err, context.Canceled) {
+		t.Fatalf("download without a free slot err = %v", err)
+	}
+}
+
 type imageAssetStoreStub struct{}
 
 func (imageAssetStoreStub) SaveImage(context.Context, []byte) (mediadomain.Asset, error) {
@@ -1365,6 +1563,32 @@ func (imageAssetStoreStub) PublicImageURL(string) string {
 	return "https://api.example/v1/media/images/img_test"
 }
 
+// imageAssetStoreEchoStub 用图片内容作为资源 ID，便于校验并发处理后的输出顺序。
+type imageAssetStoreEchoStub struct{}
+
+func (imageAssetStoreEchoStub) SaveImage(_ context.Context, raw []byte) (mediadomain.Asset, error) {
+	return mediadomain.Asset{ID: string(raw), MIMEType: "image/jpeg"}, nil
+}
+
+func (imageAssetStoreEchoStub) PublicImageURL(id string) string {
+	return "https://api.example/" + id
+}
+
+// imageAssetStoreBlockingStub 的保存会一直阻塞到 context 取消，并统计被取消的次数。
+type imageAssetStoreBlockingStub struct {
+	canceled atomic.Int32
+}
+
+func (s *imageAssetStoreBlockingStub) SaveImage(ctx context.Context, _ []byte) (mediadomain.Asset, error) {
+	<-ctx.Done()
+	s.canceled.Add(1)
+	return mediadomain.Asset{}, ctx.Err()
+}
+
+func (*imageAssetStoreBlockingStub) PublicImageURL(id string) string {
+	return "https://api.example/" + id
+}
+
 type imageAssetStoreRetryStub struct {
 	failures int
 	calls    int
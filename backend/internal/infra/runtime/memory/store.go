@@ -22,7 +22,8 @@ type rateWindow struct {
 	count     int
 }
 
-// RateLimiter 提供单实例固定分钟窗口限流。
+// RateLimiter 提供单实例固定分钟窗口限流。分片锁内只做内存读写与有界清理，
+// 不得在持锁期间执行 I/O、等待 context 或回调，否则同分片请求会被串行化。
 type RateLimiter struct {
 	shards [shardCount]rateShard
 }
@@ -29,16 +29,19 @@ const (
 	maxDeviceSessions                    = 1000
 	maxQuotaRecoveryEvents               = 100000
 	maxQuotaRefreshDirty                 = 100000
+	rateDenialShardCount                 = 64
+	maxRateDenialsPerShard               = 160
 	observedModelStateTTL                = 30 * time.Minute
 	// At the per-account cap, one pipeline processes at most 80,000 members.
 	stickyDeletePipelineSize = 8
 )
 
+// rateScript 放行时返回 -1；拒绝时返回当前窗口剩余毫秒数，供本地拒绝缓存使用。
 var rateScript = redisclient.NewScript(`
 local current = redis.call('INCR', KEYS[1])
 if current == 1 then redis.call('PEXPIRE', KEYS[1], ARGV[2]) end
-if current > tonumber(ARGV[1]) then return 0 end
-return 1
+if current > tonumber(ARGV[1]) then return math.max(redis.call('PTTL', KEYS[1]), 0) end
+return -1
 `)
 
 var acquireLeaseScript = redisclient.NewScript(`
@@ -297,6 +300,7 @@ type Store struct {
 	concurrencyReleaseDone  chan struct{}
 	closeOnce               sync.Once
 	closeErr                error
+	rateDenials             rateDenialCache
 }
 
 type concurrencyReleaseRetry struct {
@@ -449,12 +453,94 @@ func (s *Store) ListenSettingsChanges(ctx context.Context, handler func(context.
 	}
 }
 
-func (s *Store) Allow(ctx context.Context, key string, limit int, _ time.Time) (bool, error) {
+func (s *Store) Allow(ctx context.Context, key string, limit int, now time.Time) (bool, error) {
 	if limit <= 0 {
 		return true, nil
 	}
-	result, err := rateScript.Run(ctx, s.client, []string{s.key("rate", key)}, limit, time.Minute.Milliseconds()).Int()
-	return result == 1, err
+	// now 由调用方在 Redis 往返之前读取；拒绝缓存的截止时间以它为起点，
+	// 本地缓存的窗口只会比 Redis 中的键更早结束，不会更晚。
+	if now.IsZero() {
+		now = time.Now()
+	}
+	redisKey := s.key("rate", key)
+	if s.rateDenials.denied(redisKey, limit, now) {
+		return false, nil
+	}
+	result, err := rateScript.Run(ctx, s.client, []string{redisKey}, limit, time.Minute.Milliseconds()).Int64()
+	if err != nil {
+		return false, err
+	}
+	if result < 0 {
+		return true, nil
+	}
+	s.rateDenials.deny(redisKey, limit, now, now.Add(time.Duration(result)*time.Millisecond))
+	return false, nil
+}
+
+// rateDenialCache 在本地记住已超限的固定窗口直到其结束。窗口内计数只增不减，
+// 所以缓存的拒绝不会误伤；超限流量因此不再逐个往返 Redis。限额变化时缓存失效。
+// 与 memory.RateLimiter 相同按键分片加锁，单个分片的清理最多扫描分片上限条记录。
+type rateDenialCache struct {
+	shards [rateDenialShardCount]rateDenialShard
+}
+
+type rateDenialShard struct {
+	mu      sync.Mutex
+	entries map[string]rateDenial
+}
+
+type rateDenial struct {
+	limit int
+	until time.Time
+}
+
+func (c *rateDenialCache) shard(key string) *rateDenialShard {
+	const offset32 = uint32(2166136261)
+	const prime32 = uint32(16777619)
+	hash := offset32
+	for index := 0; index < len(key); index++ {
+		hash ^= uint32(key[index])
+		hash *= prime32
+	}
+	return &c.shards[hash%rateDenialShardCount]
+}
+
+func (c *rateDenialCache) denied(key string, limit int, now time.Time) bool {
+	shard := c.shard(key)
+	shard.mu.Lock()
+	defer shard.mu.Unlock()
+	entry, ok := shard.entries[key]
+	if !ok {
+		return false
+	}
+	if entry.limit != limit || !now.Before(entry.until) {
+		delete(shard.entries, key)
+		return false
+	}
+	return true
+}
+
+func (c *rateDenialCache) deny(key string, limit int, now, until time.Time) {
+	if !now.Before(until) {
+		return
+	}
+	shard := c.shard(key)
+	shard.mu.Lock()
+	defer shard.mu.Unlock()
+	if shard.entries == nil {
+		shard.entries = make(map[string]rateDenial)
+	}
+	if _, exists := shard.entries[key]; !exists && len(shard.entries) >= maxRateDenialsPerShard {
+		for candidate, entry := range shard.entries {
+			if !now.Before(entry.until) {
+				delete(shard.entries, candidate)
+			}
+		}
+		if len(shard.entries) >= maxRateDenialsPerShard {
+			return
+		}
+	}
+	shard.entries[key] = rateDenial{limit: limit, until: until}
 }
 
 func (s *Store) acquireConcurrency(ctx context.Context, key string, limit int) (func(), bool, error) {
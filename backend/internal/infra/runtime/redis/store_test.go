@@ -3,6 +3,7 @@ package redis
 import (
 	"context"
 	"errors"
+	"fmt"
 	"net"
 	"testing"
 	"time"
@@ -109,3 +110,57 @@ func (h releasePipelineHook) ProcessPipelineHook(_ redisclient.ProcessPipelineHo
 		return h.err
 	}
 }
+
+func TestRateDenialCacheHoldsUntilWindowEnd(t *testing.T) {
+	var cache rateDenialCache
+	now := time.Now()
+	if cache.denied("rate:key", 2, now) {
+		t.Fatal("empty cache must not deny")
+	}
+	cache.deny("rate:key", 2, now, now.Add(time.Hour))
+	if !cache.denied("rate:key", 2, now) {
+		t.Fatal("denial should be cached until the window ends")
+	}
+	if cache.denied("rate:key", 3, now) {
+		t.Fatal("a changed limit must bypass the cached denial")
+	}
+	if cache.denied("rate:key", 2, now) {
+		t.Fatal("a bypassed denial must be dropped")
+	}
+	cache.deny("rate:other", 2, now, now.Add(time.Millisecond))
+	if cache.denied("rate:other", 2, now.Add(time.Second)) {
+		t.Fatal("expired denial must not block the next window")
+	}
+	cache.deny("rate:past", 2, now, now.Add(-time.Second))
+	if _, ok := cache.shard("rate:past").entries["rate:past"]; ok {
+		t.Fatal("already-ended windows must not be cached")
+	}
+}
+
+func TestRateDenialCacheBoundsEachShard(t *testing.T) {
+	var cache rateDenialCache
+	now := time.Now()
+	for index := 0; index < rateDenialShardCount*maxRateDenialsPerShard*2; index++ {
+		cache.deny(fmt.Sprintf("rate:live:%d", index), 1, now, now.Add(time.Hour))
+	}
+	for index := range cache.shards {
+		if size := len(cache.shards[index].entries); size > maxRateDenialsPerShard {
+			t.Fatalf("shard %d holds %d denials", index, size)
+		}
+	}
+
+	// 满分片中已过期的记录会被回收，给新的拒绝腾出位置。
+	var expiring rateDenialCache
+	shard := expiring.shard("rate:target")
+	for index := 0; len(shard.entries) < maxRateDenialsPerShard; index++ {
+		key := fmt.Sprintf("rate:expiring:%d", index)
+		if expiring.shard(key) == shard {
+			expiring.deny(key, 1, now, now.Add(time.Millisecond))
+		}
+	}
+	later := now.Add(time.Second)
+	expiring.deny("rate:target", 1, later, later.Add(time.Hour))
+	if !expiring.denied("rate:target", 1, later) {
+		t.Fatal("expired entries should be evicted from a full shard")
+	}
+}
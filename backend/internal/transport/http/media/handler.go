@@ -13,6 +13,9 @@ import (
 	"github.com/gin-gonic/gin"
 )
 
+// immutableCacheControl 用于按内容寻址、永不改写的媒体对象。
+const immutableCacheControl = "public, max-age=31536000, immutable"
+
 type Handler struct {
 	service     *mediaapp.Service
 	ingestSlots chan struct{}
@@ -71,7 +74,7 @@ func (h *Handler) getImage(c *gin.Context) {
 	}
 	c.Header("Content-Type", asset.MIMEType)
 	c.Header("Content-Length", strconv.FormatInt(asset.SizeBytes, 10))
-	c.Header("Cache-Control", "public, max-age=31536000, immutable")
+	c.Header("Cache-Control", immutableCacheControl)
 	c.Header("ETag", etag)
 	c.Header("X-Content-Type-Options", "nosniff")
 	if c.Request.Method == http.MethodHead {
@@ -100,7 +103,7 @@ func (h *Handler) getVideo(c *gin.Context) {
 	}
 	c.Header("Content-Type", asset.MIMEType)
 	c.Header("Content-Disposition", `inline; filename="`+asset.ID+`"`)
-	c.Header("Cache-Control", "public, max-age=31536000, immutable")
+	c.Header("Cache-Control", immutableCacheControl)
 	c.Header("ETag", `"`+asset.SHA256+`"`)
 	c.Header("X-Content-Type-Options", "nosniff")
 	http.ServeContent(c.Writer, c.Request, asset.ID, asset.CreatedAt, seeker)
@@ -2,6 +2,7 @@ package middleware
 
 import (
 	"crypto/subtle"
+	"encoding/json"
 	"errors"
 	"net/http"
 	"strings"
@@ -61,7 +62,7 @@ func ClientAuth(service *clientkeyapp.Service) gin.HandlerFunc {
 		}
 		value, release, err := service.Authenticate(c.Request.Context(), raw)
 		if err != nil {
-			writeOpenAIError(c, clientErrorStatus(err), clientErrorCode(err), clientErrorMessage(err))
+			writeClientRejection(c, err)
 			return
 		}
 		defer release()
@@ -112,16 +113,80 @@ func clientErrorMessage(err error) string {
 	return err.Error()
 }
 
+// clientRejection 是 Authenticate 哨兵错误对应的预序列化拒绝响应。
+type clientRejection struct {
+	sentinel  error
+	status    int
+	openAI    []byte
+	anthropic []byte
+}
+
+// clientRejections 在启动时把固定的拒绝响应编码一次；限流和并发拒绝在压力下最频繁，
+// 不应在每次拒绝时重新构造并序列化 gin.H。
+var clientRejections = newClientRejections(
+	clientkeyapp.ErrRuntimeUnavailable,
+	clientkeyapp.ErrRateLimited,
+	clientkeyapp.ErrConcurrencyLimit,
+	clientkeyapp.ErrBillingLimit,
+	clientkeyapp.ErrInvalidKey,
+)
+
+func newClientRejections(sentinels ...error) []clientRejection {
+	items := make([]clientRejection, 0, len(sentinels))
+	for _, sentinel := range sentinels {
+		status, code, message := clientErrorStatus(sentinel), clientErrorCode(sentinel), clientErrorMessage(sentinel)
+		items = append(items, clientRejection{
+			sentinel:  sentinel,
+			status:    status,
+			openAI:    mustMarshalJSON(openAIErrorBody(code, message)),
+			anthropic: mustMarshalJSON(anthropicErrorBody(status, message)),
+		})
+	}
+	return items
+}
+
+func mustMarshalJSON(value any) []byte {
+	body, err := json.Marshal(value)
+	if err != nil {
+		panic(err)
+	}
+	return body
+}
+
+func writeClientRejection(c *gin.Context, err error) {
+	for _, item := range clientRejections {
+		if !errors.Is(err, item.sentinel) {
+			continue
+		}
+		body := item.openAI
+		if c.Request.URL.Path == "/v1/messages" {
+			body = item.anthropic
+		}
+		c.Data(item.status, "application/json; charset=utf-8", body)
+		c.Abort()
+		return
+	}
+	writeOpenAIError(c, clientErrorStatus(err), clientErrorCode(err), clientErrorMessage(err))
+}
+
 func writeOpenAIError(c *gin.Context, status int, code, message string) {
 	if c.Request.URL.Path == "/v1/messages" {
-		errorType := "authentication_error"
-		if status == http.StatusTooManyRequests {
-			errorType = "rate_limit_error"
-		} else if status >= 500 {
-			errorType = "api_error"
-		}
-		c.AbortWithStatusJSON(status, gin.H{"type": "error", "error": gin.H{"type": errorType, "message": message}})
+		c.AbortWithStatusJSON(status, anthropicErrorBody(status, message))
 		return
 	}
-	c.AbortWithStatusJSON(status, gin.H{"error": gin.H{"message": message, "type": "invalid_request_error", "code": code, "param": nil}})
+	c.AbortWithStatusJSON(status, openAIErrorBody(code, message))
+}
+
+func openAIErrorBody(code, message string) gin.H {
+	return gin.H{"error": gin.H{"message": message, "type": "invalid_request_error", "code": code, "param": nil}}
+}
+
+func anthropicErrorBody(status int, message string) gin.H {
+	errorType := "authentication_error"
+	if status == http.StatusTooManyRequests {
+		errorType = "rate_limit_error"
+	} else if status >= 500 {
+		errorType = "api_error"
+	}
+	return gin.H{"type": "error", "error": gin.H{"type": errorType, "message": message}}
 }
@@ -58,3 +58,37 @@ func TestBearerTokenAcceptsCaseInsensitiveSchemeAndWhitespace(t *testing.T) {
 		}
 	}
 }
+
+func TestClientRejectionBodiesMatchDynamicEncoding(t *testing.T) {
+	gin.SetMode(gin.TestMode)
+	errs := []error{
+		clientkeyapp.ErrInvalidKey,
+		clientkeyapp.ErrRateLimited,
+		clientkeyapp.ErrConcurrencyLimit,
+		clientkeyapp.ErrBillingLimit,
+		errors.Join(clientkeyapp.ErrRuntimeUnavailable, errors.New("redis unavailable")),
+	}
+	for _, path := range []string{"/v1/chat/completions", "/v1/messages"} {
+		for _, err := range errs {
+			cached := httptest.NewRecorder()
+			cachedContext, _ := gin.CreateTestContext(cached)
+			cachedContext.Request = httptest.NewRequest(http.MethodPost, path, nil)
+			writeClientRejection(cachedContext, err)
+
+			dynamic := httptest.NewRecorder()
+			dynamicContext, _ := gin.CreateTestContext(dynamic)
+			dynamicContext.Request = httptest.NewRequest(http.MethodPost, path, nil)
+			writeOpenAIError(dynamicContext, clientErrorStatus(err), clientErrorCode(err), clientErrorMessage(err))
+
+			if !cachedContext.IsAborted() || cached.Code != dynamic.Code {
+				t.Fatalf("%s %v: status = %d, want %d", path, err, cached.Code, dynamic.Code)
+			}
+			if cached.Body.String() != dynamic.Body.String() {
+				t.Fatalf("%s %v: body = %s, want %s", path, err, cached.Body.String(), dynamic.Body.String())
+			}
+			if cached.Header().Get("Content-Type") != dynamic.Header().Get("Content-Type") {
+				t.Fatalf("%s %v: content type = %q", path, err, cached.Header().Get("Content-Type"))
+			}
+		}
+	}
+}
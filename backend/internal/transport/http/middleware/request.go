@@ -2,6 +2,7 @@ package middleware
 
 import (
 	"context"
+	"io"
 	"log/slog"
 	"net/http"
 	"strconv"
@@ -73,19 +74,49 @@ func MaxBodyBytes(limit int64) gin.HandlerFunc {
 					effective = mediaUploadMaxBytes
 				}
 			}
-			c.Request.Body = http.MaxBytesReader(c.Writer, c.Request.Body, effective)
+			switch {
+			case c.Request.ContentLength > effective:
+				// 声明长度已超限：首次读取即返回 MaxBytesError，由各路由按自身格式回 413，
+				// 不再先读入 effective 字节才发现超限。
+				c.Request.Body = declaredTooLargeBody{ReadCloser: c.Request.Body, limit: effective}
+			case c.Request.ContentLength >= 0:
+				// net/http 已按声明长度截断请求体（HTTP/2 对超出声明的数据直接报错），
+				// 长度未超限时无需再包一层计数读取器。
+			default:
+				c.Request.Body = http.MaxBytesReader(c.Writer, c.Request.Body, effective)
+			}
 		}
 		c.Next()
 	}
 }
 
+type declaredTooLargeBody struct {
+	io.ReadCloser
+	limit int64
+}
+
+func (b declaredTooLargeBody) Read([]byte) (int, error) {
+	return 0, &http.MaxBytesError{Limit: b.limit}
+}
+
 // SecurityHeaders 为 API 和媒体响应添加通用浏览器安全边界。
 func SecurityHeaders() gin.HandlerFunc {
+	// 键已是规范形式、值不变，直接写入共享的单元素切片，省去每个响应逐个 Set
+	// 的规范化与切片分配；后续 Set/Add 会替换或重新分配，不会改写共享值。
+	headers := [...]struct {
+		name  string
+		value []string
+	}{
+		{name: "X-Content-Type-Options", value: []string{"nosniff"}},
+		{name: "X-Frame-Options", value: []string{"DENY"}},
+		{name: "Referrer-Policy", value: []string{"no-referrer"}},
+		{name: "Permissions-Policy", value: []string{"camera=(), microphone=(), geolocation=()"}},
+	}
 	return func(c *gin.Context) {
-		c.Header("X-Content-Type-Options", "nosniff")
-		c.Header("X-Frame-Options", "DENY")
-		c.Header("Referrer-Policy", "no-referrer")
-		c.Header("Permissions-Policy", "camera=(), microphone=(), geolocation=()")
+		header := c.Writer.Header()
+		for _, item := range headers {
+			header[item.name] = item.value
+		}
 		c.Next()
 	}
 }
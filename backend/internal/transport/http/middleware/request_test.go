@@ -1,6 +1,7 @@
 package middleware
 
 import (
+	"errors"
 	"io"
 	"net/http"
 	"net/http/httptest"
@@ -47,6 +48,61 @@ func TestMaxBodyBytesLimitsAllRequestBodies(t *testing.T) {
 	}
 }
 
+type countingReader struct {
+	reader io.Reader
+	read   int
+}
+
+func (r *countingReader) Read(p []byte) (int, error) {
+	n, err := r.reader.Read(p)
+	r.read += n
+	return n, err
+}
+
+func TestMaxBodyBytesRejectsDeclaredOversizeWithoutReading(t *testing.T) {
+	gin.SetMode(gin.TestMode)
+	router := gin.New()
+	router.Use(MaxBodyBytes(4))
+	router.POST("/", func(c *gin.Context) {
+		_, err := io.ReadAll(c.Request.Body)
+		var sizeError *http.MaxBytesError
+		if errors.As(err, &sizeError) {
+			c.Status(http.StatusRequestEntityTooLarge)
+			return
+		}
+		if err != nil {
+			c.Status(http.StatusBadRequest)
+			return
+		}
+		c.Status(http.StatusNoContent)
+	})
+
+	body := &countingReader{reader: strings.NewReader("12345678")}
+	request := httptest.NewRequest(http.MethodPost, "/", body)
+	request.ContentLength = 8
+	response := httptest.NewRecorder()
+	router.ServeHTTP(response, request)
+	if response.Code != http.StatusRequestEntityTooLarge || body.read != 0 {
+		t.Fatalf("status = %d, read = %d", response.Code, body.read)
+	}
+
+	// 未声明长度时仍由 MaxBytesReader 在读取中途截断。
+	request = httptest.NewRequest(http.MethodPost, "/", &countingReader{reader: strings.NewReader("12345678")})
+	request.ContentLength = -1
+	response = httptest.NewRecorder()
+	router.ServeHTTP(response, request)
+	if response.Code != http.StatusRequestEntityTooLarge {
+		t.Fatalf("unknown length status = %d", response.Code)
+	}
+
+	request = httptest.NewRequest(http.MethodPost, "/", strings.NewReader("1234"))
+	response = httptest.NewRecorder()
+	router.ServeHTTP(response, request)
+	if response.Code != http.StatusNoContent {
+		t.Fatalf("declared within limit status = %d", response.Code)
+	}
+}
+
 func TestObserveBodyMemoryRecordsActualAndDeclaredBytes(t *testing.T) {
 	registry := perfmetrics.NewRegistry()
 	previous := perfmetrics.Default
@@ -216,6 +272,15 @@ func TestSecurityHeaders(t *testing.T) {
 	router := gin.New()
 	router.Use(SecurityHeaders())
 	router.GET("/", func(c *gin.Context) { c.Status(http.StatusNoContent) })
+	router.GET("/framed", func(c *gin.Context) {
+		c.Writer.Header().Add("X-Frame-Options", "SAMEORIGIN")
+		c.Status(http.StatusNoContent)
+	})
+	framed := httptest.NewRecorder()
+	router.ServeHTTP(framed, httptest.NewRequest(http.MethodGet, "/framed", nil))
+	if values := framed.Header().Values("X-Frame-Options"); len(values) != 2 {
+		t.Fatalf("framed X-Frame-Options = %q", values)
+	}
 	response := httptest.NewRecorder()
 	router.ServeHTTP(response, httptest.NewRequest(http.MethodGet, "/", nil))
 	for name, expected := range map[string]string{
@@ -224,8 +289,8 @@ func TestSecurityHeaders(t *testing.T) {
 		"Referrer-Policy":        "no-referrer",
 		"Permissions-Policy":     "camera=(), microphone=(), geolocation=()",
 	} {
-		if value := response.Header().Get(name); value != expected {
-			t.Fatalf("%s = %q", name, value)
+		if values := response.Header().Values(name); len(values) != 1 || values[0] != expected {
+			t.Fatalf("%s = %q", name, values)
 		}
 	}
 }
@@ -105,6 +105,13 @@ type ReadinessSnapshot struct {
 	Startup    *ReadinessStartupReport       `json:"startup,omitempty"`
 }
 
+// 存活探针与旧版 Ready 回调只有固定响应，预先编码避免探针每次都走一遍 JSON 序列化。
+var (
+	healthzBody        = []byte(`{"ok":true}`)
+	legacyReadyBody    = []byte(`{"ready":true,"state":"ready"}`)
+	legacyNotReadyBody = []byte(`{"ready":false,"state":"not_ready"}`)
+)
+
 // New 创建完整 HTTP 路由并明确区分公共、管理员和客户端鉴权边界。
 func New(deps Dependencies) *gin.Engine {
 	if deps.ConcurrencyGate == nil {
@@ -116,7 +123,7 @@ func New(deps Dependencies) *gin.Engine {
 	}
 	router := gin.New()
 	router.Use(gin.Recovery(), middleware.RequestID(), middleware.SecurityHeaders(), middleware.MaxBodyBytes(deps.MaxBodyBytes), middleware.Timeout(deps.RequestTimeout), middleware.AccessLog(deps.Logger))
-	router.GET("/healthz", func(c *gin.Context) { c.JSON(http.StatusOK, gin.H{"ok": true}) })
+	router.GET("/healthz", func(c *gin.Context) { c.Data(http.StatusOK, "application/json; charset=utf-8", healthzBody) })
 	router.GET("/readyz", func(c *gin.Context) {
 		if deps.Readiness != nil {
 			snapshot := deps.Readiness(c.Request.Context())
@@ -128,10 +135,10 @@ func New(deps Dependencies) *gin.Engine {
 			return
 		}
 		if deps.Ready != nil && deps.Ready(c.Request.Context()) {
-			c.JSON(http.StatusOK, gin.H{"ready": true, "state": "ready"})
+			c.Data(http.StatusOK, "application/json; charset=utf-8", legacyReadyBody)
 			return
 		}
-		c.JSON(http.StatusServiceUnavailable, gin.H{"ready": false, "state": "not_ready"})
+		c.Data(http.StatusServiceUnavailable, "application/json; charset=utf-8", legacyNotReadyBody)
 	})
 	if deps.SwaggerEnabled {
 		router.GET("/swagger/*any", ginSwagger.WrapHandler(swaggerFiles.Handler))
@@ -60,6 +60,49 @@ func TestReadinessEndpointReturns503WhileReconciling(t *testing.T) {
 	}
 }
 
+func TestHealthzReturnsFixedBody(t *testing.T) {
+	router := New(testDependencies())
+	recorder := httptest.NewRecorder()
+	router.ServeHTTP(recorder, httptest.NewRequest(http.MethodGet, "/healthz", nil))
+	if recorder.Code != http.StatusOK || recorder.Body.String() != `{"ok":true}` {
+		t.Fatalf("status=%d body=%s", recorder.Code, recorder.Body.String())
+	}
+	if contentType := recorder.Header().Get("Content-Type"); contentType != "application/json; charset=utf-8" {
+		t.Fatalf("content type = %q", contentType)
+	}
+}
+
+func TestLegacyReadyCallbackReturnsFixedBodies(t *testing.T) {
+	for _, test := range []struct {
+		ready  bool
+		status int
+		state  string
+	}{
+		{ready: true, status: http.StatusOK, state: "ready"},
+		{ready: false, status: http.StatusServiceUnavailable, state: "not_ready"},
+	} {
+		deps := testDependencies()
+		ready := test.ready
+		deps.Ready = func(context.Context) bool { return ready }
+		router := New(deps)
+		recorder := httptest.NewRecorder()
+		router.ServeHTTP(recorder, httptest.NewRequest(http.MethodGet, "/readyz", nil))
+		var body struct {
+			Ready bool   `json:"ready"`
+			State string `json:"state"`
+		}
+		if err := json.Unmarshal(recorder.Body.Bytes(), &body); err != nil {
+			t.Fatal(err)
+		}
+		if recorder.Code != test.status || body.Ready != test.ready || body.State != test.state {
+			t.Fatalf("status=%d body=%s", recorder.Code, recorder.Body.String())
+		}
+		if contentType := recorder.Header().Get("Content-Type"); contentType != "application/json; charset=utf-8" {
+			t.Fatalf("content type = %q", contentType)
+		}
+	}
+}
+
 func TestInferenceTrafficIsRejectedWhileReconciling(t *testing.T) {
 	deps := testDependencies()
 	deps.TrafficReady = func() bool { return false }